@@ -8,28 +8,141 @@ FTP downloader utilities (updated).
 - Matches .txt files that start with station ID (both with/without timestamps)
 - Saves to local folder: <local_base>/<State>/<StationID>/<YYYY>/<MM>/<DD>/
 - Skips existing files (no overwrite)
-- Uses pause_event / cancel_event for pause/cancel support
+- Uses pause_event (Pause) / cancel_event for pause/cancel support
 """
 
+import atexit
 import os
+import re
+import socket
 import time
 import ftplib
-from datetime import datetime, timedelta
+import queue
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 import threading
-from typing import List, Tuple, Callable, Optional
+import weakref
+from typing import List, Tuple, Callable, Optional, Union
 
 _cancel_global = False
+
+_WRITE_BUFFER = 1 << 20      # local file buffer for downloads
+_PROGRESS_BYTES = 262144     # report progress at most every 256 KiB ...
+_PROGRESS_INTERVAL = 0.1     # ... or every 100 ms
+_STALE_AFTER = 15.0          # NOOP-check pooled connections idle this long
+_POOL_IDLE_MAX = 60.0        # registry pools QUIT connections idle longer than this
+_SEGMENT_MIN = 32 << 20      # only split files at least this large across streams
 def set_global_cancel(val: bool = True):
     global _cancel_global
     _cancel_global = val
+    if val:
+        for p in list(_pauses):
+            p.wake()
+
+_pauses = weakref.WeakSet()
+
+class Pause:
+    """
+    Drop-in replacement for a pause threading.Event (set = paused) that
+    downloads block on with a Condition instead of a sleep loop: clear()
+    resumes every waiter at once, wake() lets them re-check for a cancel.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._paused = False
+        _pauses.add(self)
+
+    def set(self):
+        with self._cond:
+            self._paused = True
+
+    def clear(self):
+        with self._cond:
+            self._paused = False
+            self._cond.notify_all()
+
+    def is_set(self) -> bool:
+        return self._paused
+
+    def wake(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def wait_resumed(self, cancel_event: threading.Event) -> bool:
+        """Block while paused; False if cancelled meanwhile."""
+        with self._cond:
+            while self._paused:
+                if cancel_event.is_set() or _cancel_global:
+                    return False
+                self._cond.wait()
+        return True
+
+def _wait_while_paused(pause_event, cancel_event: threading.Event) -> bool:
+    if isinstance(pause_event, Pause):
+        return pause_event.wait_resumed(cancel_event)
+    # plain threading.Event: poll, waking early on cancel
+    while pause_event.is_set():
+        if cancel_event.wait(0.2) or _cancel_global:
+            return False
+    return True
+
+def _set_nodelay(sock):
+    # FTP is request/response over small packets; don't let Nagle hold them back
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except (OSError, AttributeError):
+        pass
+
+class FTPSession(ftplib.FTP):
+    """
+    ftplib.FTP that remembers the directory it last changed into, so repeated
+    cwd_if_needed() calls for the same folder cost no round-trip, and keeps a
+    handle on its data connection so another thread can abort_transfer().
+    """
+    cur_dir = None
+    data_sock = None
+    aborted = False
+    mlst_opts_done = False  # OPTS MLST already sent (or rejected) on this session
+
+    def cwd(self, dirname):
+        self.cur_dir = None
+        resp = super().cwd(dirname)
+        # relative moves can't be compared later; only track absolute paths
+        if dirname.startswith("/"):
+            self.cur_dir = dirname
+        return resp
+
+    def cwd_if_needed(self, dirname: str):
+        if self.cur_dir != dirname:
+            self.cwd(dirname)
+
+    def ntransfercmd(self, cmd, rest=None):
+        conn, size = super().ntransfercmd(cmd, rest)
+        _set_nodelay(conn)
+        self.data_sock = conn
+        return conn, size
+
+    def abort_transfer(self):
+        # wakes a retrbinary blocked in recv() (or waiting for the final reply);
+        # the session is unusable afterwards. Closed sockets just raise OSError.
+        self.aborted = True
+        for conn in (self.data_sock, self.sock):
+            if conn is not None:
+                try:
+                    conn.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
 
 def ftp_connect(host: str, user: str, passwd: str, port: int = 21,
-                timeout: int = 30, retries: int = 3, delay: int = 2) -> ftplib.FTP:
+                timeout: int = 30, retries: int = 3, delay: int = 2) -> FTPSession:
     last_exc = None
     for attempt in range(1, retries + 1):
         try:
-            ftp = ftplib.FTP()
+            ftp = FTPSession()
             ftp.connect(host, port, timeout=timeout)
+            _set_nodelay(ftp.sock)
             ftp.login(user, passwd)
             ftp.set_pasv(True)
             return ftp
@@ -38,85 +151,621 @@ def ftp_connect(host: str, user: str, passwd: str, port: int = 21,
             time.sleep(delay)
     raise ConnectionError(f"FTP connection failed after {retries} attempts: {last_exc}")
 
-def list_files(ftp: ftplib.FTP, remote_dir: str) -> List[str]:
+class FTPConnectionPool:
+    """
+    Small pool of authenticated FTP connections to a single server.
+    Connections are opened on demand (up to `size`) via ftp_connect and handed
+    out with the `connection()` context manager, so several files can be
+    retrieved at once instead of one RETR after another.
+
+    The pool also memoizes remote path resolution and directory listings, so
+    reusing one pool for every station of a run probes and lists each date
+    folder only once. Create a new pool (or call clear_cache) to see changes.
+    Lookups run on one extra dedicated connection, so the next folder can be
+    listed while all `size` connections are busy downloading.
+    """
+
+    def __init__(self, host: str, user: str, passwd: str, port: int = 21,
+                 size: int = 4, retries: int = 3):
+        self.host = host
+        self.user = user
+        self.passwd = passwd
+        self.port = port
+        self.size = max(1, size)
+        self.retries = retries
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._meta = None
+        self._meta_used = 0.0     # monotonic time the lookup connection was last used
+        self._meta_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._path_cache = {}     # (base_path, (y, m, d)) -> remote path or None
+        self._listing_cache = {}  # remote path -> list of (name, facts)
+
+    def _checked(self, item, check: bool = False) -> Optional[FTPSession]:
+        ftp, idle_since = item
+        if check or time.monotonic() - idle_since > _STALE_AFTER:
+            # the server may have dropped a long-idle connection
+            try:
+                ftp.voidcmd("NOOP")
+            except Exception:
+                self.discard(ftp)
+                self.release(ftp)
+                return None
+        return ftp
+
+    def acquire(self, check: bool = False) -> FTPSession:
+        # check=True NOOPs any idle connection handed out, however recently used
+        while True:
+            try:
+                ftp = self._checked(self._idle.get_nowait(), check)
+                if ftp is not None:
+                    return ftp
+                continue
+            except queue.Empty:
+                pass
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                try:
+                    return ftp_connect(self.host, self.user, self.passwd,
+                                       port=self.port, retries=self.retries)
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            # pool exhausted: wait for a release (re-check periodically in
+            # case a discarded connection freed a slot instead)
+            try:
+                ftp = self._checked(self._idle.get(timeout=0.5), check)
+            except queue.Empty:
+                continue
+            if ftp is not None:
+                return ftp
+
+    def release(self, ftp: FTPSession):
+        # closed (discarded) or aborted connections give their slot back instead
+        if ftp.aborted:
+            self.discard(ftp)
+        if ftp.sock is None:
+            with self._lock:
+                self._opened -= 1
+            return
+        self._idle.put((ftp, time.monotonic()))
+
+    def discard(self, ftp: FTPSession):
+        # close without QUIT; release() will then drop it from the pool
+        try:
+            ftp.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self, check: bool = False):
+        ftp = self.acquire(check)
+        try:
+            yield ftp
+        except Exception:
+            self.discard(ftp)
+            raise
+        finally:
+            self.release(ftp)
+
+    @contextmanager
+    def _meta_connection(self):
+        # dedicated connection for CWD probes and listings
+        with self._meta_lock:
+            if (self._meta is not None and self._meta.sock is not None
+                    and time.monotonic() - self._meta_used > _STALE_AFTER):
+                # same liveness check as _checked(): the server may have dropped it
+                try:
+                    self._meta.voidcmd("NOOP")
+                except Exception:
+                    self.discard(self._meta)
+            if self._meta is None or self._meta.sock is None or self._meta.aborted:
+                self._meta = ftp_connect(self.host, self.user, self.passwd,
+                                         port=self.port, retries=self.retries)
+            try:
+                yield self._meta
+            except Exception:
+                self.discard(self._meta)
+                raise
+            finally:
+                self._meta_used = time.monotonic()
+
+    def _lookup(self, fn, *args):
+        # run fn(ftp, *args) on the lookup connection; retry once on a fresh one,
+        # since the server may drop it sooner than _STALE_AFTER
+        for attempt in range(2):
+            try:
+                with self._meta_connection() as ftp:
+                    return fn(ftp, *args)
+            except FileNotFoundError:
+                raise
+            except (OSError, EOFError, ftplib.error_temp):
+                if attempt:
+                    raise
+
+    def resolve_path(self, base_path: str, date_obj: date) -> Optional[str]:
+        """Cached find_existing_remote_path for this server."""
+        key = (base_path, (date_obj.year, date_obj.month, date_obj.day))
+        with self._cache_lock:
+            if key in self._path_cache:
+                return self._path_cache[key]
+        path = self._lookup(find_existing_remote_path, base_path, date_obj)
+        with self._cache_lock:
+            self._path_cache[key] = path
+        return path
+
+    def list_dir(self, remote_path: str) -> List[Tuple[str, dict]]:
+        """Cached list_files of remote_path (empty list if it can't be listed)."""
+        with self._cache_lock:
+            if remote_path in self._listing_cache:
+                return self._listing_cache[remote_path]
+        try:
+            files = self._lookup(list_files, remote_path)
+        except FileNotFoundError:
+            files = []
+        with self._cache_lock:
+            self._listing_cache[remote_path] = files
+        return files
+
+    def evict_idle(self, max_idle: float):
+        """QUIT idle connections unused for more than max_idle seconds."""
+        keep = []
+        now = time.monotonic()
+        while True:
+            try:
+                item = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if now - item[1] <= max_idle:
+                keep.append(item)
+                continue
+            try:
+                item[0].quit()
+            except Exception:
+                item[0].close()
+            with self._lock:
+                self._opened -= 1
+        for item in keep:
+            self._idle.put(item)
+        # the lookup connection too, unless a lookup is using it right now
+        if self._meta_lock.acquire(blocking=False):
+            try:
+                if self._meta is not None and now - self._meta_used > max_idle:
+                    try:
+                        self._meta.quit()
+                    except Exception:
+                        self._meta.close()
+                    self._meta = None
+            finally:
+                self._meta_lock.release()
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._path_cache.clear()
+            self._listing_cache.clear()
+
+    def close(self):
+        while True:
+            try:
+                ftp, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                ftp.quit()
+            except Exception:
+                pass
+            with self._lock:
+                self._opened -= 1
+        with self._meta_lock:
+            if self._meta is not None:
+                try:
+                    self._meta.quit()
+                except Exception:
+                    pass
+                self._meta = None
+
+# Process-wide pools keyed by server login, reused across single downloads,
+# previews and connection tests so repeated operations skip the login
+_pools = {}
+_pools_lock = threading.Lock()
+_janitor = None
+
+def _janitor_loop():
+    # servers drop idle sessions eventually anyway; close ours first
+    while True:
+        time.sleep(_POOL_IDLE_MAX / 2)
+        with _pools_lock:
+            pools = list(_pools.values())
+        for pool in pools:
+            pool.evict_idle(_POOL_IDLE_MAX)
+
+def get_pool(host: str, user: str, passwd: str, port: int = 21, retries: int = 3,
+             size: int = 4, tag: str = "") -> FTPConnectionPool:
+    """
+    Shared pool for one server login. A different `tag` gives a separate pool, so
+    e.g. UI previews never wait behind connections busy with downloads.
+    `size` only applies when the pool is first created.
+    """
+    global _janitor
+    key = (host, port, user, passwd, tag)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = FTPConnectionPool(host, user, passwd, port=port, size=size, retries=retries)
+        if _janitor is None:
+            _janitor = threading.Thread(target=_janitor_loop, name="ftp-pool-janitor", daemon=True)
+            _janitor.start()
+    return pool
+
+def close_pools():
+    # QUIT idle pooled connections (registered with atexit)
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+atexit.register(close_pools)
+
+def list_files(ftp: FTPSession, remote_dir: str) -> List[Tuple[str, dict]]:
     """
     List files in remote_dir. Prefer MLSD, fallback to NLST.
-    Returns list of filenames (str).
+    Returns list of (filename, facts) tuples; with MLSD the facts carry "size"
+    and "type" from the same round-trip, with NLST they are empty.
     Throws FileNotFoundError if remote_dir doesn't exist.
+    Leaves the connection in remote_dir.
     """
-    cur = None
-    try:
-        cur = ftp.pwd()
-    except Exception:
-        cur = None
     try:
-        ftp.cwd(remote_dir)
-    except Exception as e:
+        ftp.cwd_if_needed(remote_dir)
+    except ftplib.error_perm as e:
+        # only a 5xx reply means "missing"; connection errors propagate
         raise FileNotFoundError(f"Remote directory not found: {remote_dir} ({e})")
 
     files = []
-    # Try MLSD
+    # Try MLSD (ask only for the facts we use; not every server supports OPTS).
+    # The fact selection lasts for the session, so send it once per connection.
     try:
-        try:
-            for name, facts in ftp.mlsd("."):
-                t = facts.get("type", "")
-                if t in ("file", ""):
-                    files.append(name)
-        except Exception:
-            files = ftp.nlst()
-            files = [f for f in files if f not in (".", "..")]
-    finally:
-        if cur:
+        if not ftp.mlst_opts_done:
+            ftp.mlst_opts_done = True
             try:
-                ftp.cwd(cur)
-            except Exception:
+                ftp.sendcmd("OPTS MLST type;size;")
+            except ftplib.Error:
                 pass
+        for name, facts in ftp.mlsd("."):
+            t = facts.get("type", "")
+            if t in ("file", ""):
+                files.append((name, facts))
+    except Exception:
+        try:
+            files = [(os.path.basename(f), {}) for f in ftp.nlst() if f not in (".", "..")]
+        except ftplib.error_perm:
+            # some servers answer NLST of an empty folder with 550
+            files = []
     return files
 
+def list_entries(ftp: FTPSession, remote_dir: str = ".", limit: int = 1000) -> List[Tuple[str, dict]]:
+    """
+    First `limit` entries (files and directories) of remote_dir as (name, facts).
+    MLSD lines are parsed as they arrive and the transfer is dropped once the
+    limit is reached (ftplib's mlsd() would buffer the whole listing first).
+    Falls back to NLST, with empty facts, on servers without MLSD.
+    """
+    entries = []
+    try:
+        ftp.voidcmd("TYPE A")
+        conn = ftp.transfercmd(f"MLSD {remote_dir}")
+    except ftplib.error_perm:
+        return [(os.path.basename(f), {}) for f in ftp.nlst(remote_dir)
+                if f not in (".", "..")][:limit]
+    truncated = False
+    with conn, conn.makefile("r", encoding=ftp.encoding) as fp:
+        for line in fp:
+            facts_found, _, name = line.rstrip("\r\n").partition(" ")
+            facts = {}
+            for fact in facts_found[:-1].split(";"):
+                key, _, value = fact.partition("=")
+                facts[key.lower()] = value
+            if facts.get("type") in ("cdir", "pdir"):
+                continue
+            entries.append((name, facts))
+            if len(entries) >= limit:
+                truncated = True
+                break
+    if truncated:
+        # closing the data connection early ends the transfer with 226 or 426/451
+        try:
+            ftp.getresp()
+        except (ftplib.error_temp, ftplib.error_reply):
+            pass
+    else:
+        ftp.voidresp()
+    return entries
+
+# directories already created by _safe_makedirs during the current run
+_mkdir_cache = set()
+_mkdir_lock = threading.Lock()
+
 def _safe_makedirs(path: str):
-    # create path if not exists (race safe)
+    # create path if not exists (race safe); skip the syscalls for known dirs
+    if path in _mkdir_cache:
+        return
     try:
         os.makedirs(path, exist_ok=True)
     except Exception:
-        pass
+        return
+    with _mkdir_lock:
+        _mkdir_cache.add(path)
+
+_tls = threading.local()
+
+def _recv_buffer(size: int) -> bytearray:
+    # one receive buffer per thread, reused across downloads
+    buf = getattr(_tls, "recv_buf", None)
+    if buf is None or len(buf) != size:
+        buf = _tls.recv_buf = bytearray(size)
+    return buf
 
 def download_file_with_progress(
         ftp: ftplib.FTP,
         remote_file: str,
         local_path: str,
-        pause_event: threading.Event,
+        pause_event: Union[Pause, threading.Event],
         cancel_event: threading.Event,
         progress_callback: Optional[Callable[[int, Optional[int], str], None]] = None,
-        chunk_size: int = 8192
+        chunk_size: int = 262144,
+        total: Optional[int] = None,
+        errors: Optional[List[Exception]] = None
     ) -> bool:
+    """
+    RETR remote_file into local_path. Pass `total` when the size is already
+    known (e.g. from MLSD facts) to skip the SIZE round-trip. On failure the
+    cause is appended to `errors`, if given.
+    """
     try:
         _safe_makedirs(os.path.dirname(local_path) or ".")
-        total = None
-        try:
-            total = ftp.size(remote_file)
-        except Exception:
-            total = None
+        if total is None:
+            try:
+                total = ftp.size(remote_file)
+            except Exception:
+                total = None
 
         received = 0
-        with open(local_path, "wb") as f:
-            def _callback(chunk):
-                nonlocal received
-                if cancel_event.is_set() or _cancel_global:
-                    raise Exception("Cancelled")
-                while pause_event.is_set():
-                    time.sleep(0.2)
+        last_report = 0
+        last_ts = time.monotonic()
+        fname = os.path.basename(remote_file)
+
+        def _report():
+            try:
+                progress_callback(received, total, fname)
+            except Exception:
+                pass
+
+        # 1 MiB write buffer: one write(2) per several received blocks
+        with open(local_path, "wb", buffering=_WRITE_BUFFER) as f:
+            # RETR by hand (as retrbinary does) but recv_into one reused buffer,
+            # so the loop allocates no bytes objects per block
+            buf = _recv_buffer(chunk_size)
+            view = memoryview(buf)
+            ftp.voidcmd("TYPE I")
+            with ftp.transfercmd(f"RETR {remote_file}") as conn:
+                while True:
+                    n = conn.recv_into(buf)
+                    if not n:
+                        break
                     if cancel_event.is_set() or _cancel_global:
                         raise Exception("Cancelled")
-                f.write(chunk)
-                received += len(chunk)
-                if progress_callback:
-                    try:
-                        progress_callback(received, total, os.path.basename(remote_file))
-                    except Exception:
-                        pass
+                    if pause_event.is_set() and not _wait_while_paused(pause_event, cancel_event):
+                        raise Exception("Cancelled")
+                    f.write(view[:n])
+                    received += n
+                    # throttle progress to every _PROGRESS_BYTES or _PROGRESS_INTERVAL
+                    if progress_callback:
+                        now = time.monotonic()
+                        if received - last_report >= _PROGRESS_BYTES or now - last_ts > _PROGRESS_INTERVAL:
+                            last_report = received
+                            last_ts = now
+                            _report()
+            ftp.voidresp()
+            if (cancel_event.is_set() or _cancel_global) and (total is None or received < total):
+                # data socket was shut down by a cancel; the file is incomplete
+                raise Exception("Cancelled")
+        if progress_callback and received != last_report:
+            _report()
+        return True
+    except Exception as e:
+        if errors is not None:
+            errors.append(e)
+        try:
+            if os.path.exists(local_path):
+                os.remove(local_path)
+        except Exception:
+            pass
+        return False
+
+class _SegmentsUnavailable(Exception):
+    # REST rejected or no connection to spare: fetch the file in one stream instead
+    pass
+
+def _fetch_segment(pool: FTPConnectionPool,
+                   remote_file: str, local_path: str, offset: int, length: int,
+                   pause_event: Union[Pause, threading.Event],
+                   cancel_event: threading.Event,
+                   stop: threading.Event,
+                   on_bytes: Callable[[int], None],
+                   on_conn: Optional[Callable[[FTPSession, bool], None]] = None) -> None:
+    """
+    REST to `offset` and RETR exactly `length` bytes of remote_file into the
+    same range of local_path, over a connection borrowed from pool.
+    """
+    try:
+        ftp = pool.acquire()
+    except Exception as e:
+        # e.g. the server caps connections per client
+        raise _SegmentsUnavailable(str(e))
+    if on_conn:
+        on_conn(ftp, True)
+    try:
+        ftp.voidcmd("TYPE I")
+        try:
+            conn = ftp.transfercmd(f"RETR {remote_file}", rest=offset)
+        except (ftplib.error_perm, ftplib.error_reply) as e:
+            if str(e)[:3] in ("500", "501", "502", "504"):
+                raise _SegmentsUnavailable(str(e))
+            raise
+        # own handle per segment: seek + write works everywhere (no os.pwrite on Windows)
+        with conn, open(local_path, "r+b", buffering=_WRITE_BUFFER) as f:
+            f.seek(offset)
+            buf = _recv_buffer(262144)
+            view = memoryview(buf)
+            remaining = length
+            while remaining > 0:
+                n = conn.recv_into(buf, min(len(buf), remaining))
+                if not n:
+                    raise EOFError(f"short read at {offset + length - remaining}")
+                if stop.is_set() or cancel_event.is_set() or _cancel_global:
+                    raise Exception("Cancelled")
+                if pause_event.is_set() and not _wait_while_paused(pause_event, cancel_event):
+                    raise Exception("Cancelled")
+                f.write(view[:n])
+                remaining -= n
+                on_bytes(n)
+    finally:
+        if on_conn:
+            on_conn(ftp, False)
+        # the RETR is cut short on purpose, so the connection can't be reused
+        pool.discard(ftp)
+        pool.release(ftp)
+
+def download_file_parallel(
+        host: str, user: str, passwd: str,
+        remote_path: str,
+        local_path: str,
+        streams: int = 4,
+        port: int = 21,
+        pause_event: Optional[Union[Pause, threading.Event]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        progress_callback: Optional[Callable[[int, Optional[int], str], None]] = None,
+        total: Optional[int] = None,
+        pool: Optional[FTPConnectionPool] = None,
+        on_conn: Optional[Callable[[FTPSession, bool], None]] = None
+    ) -> bool:
+    """
+    Retrieve one file over up to `streams` connections, each fetching its own
+    byte range (REST <offset> + RETR) straight into a pre-sized local file.
+    remote_path must be absolute. Connections come from `pool` (so the server
+    never sees more than its size) or from a private pool of `streams`.
+    Falls back to a single stream when the size is unknown, the server rejects
+    REST, or a segment can't get a connection.
+    on_conn(ftp, busy) is told when a transfer starts/stops on a connection,
+    so the caller can abort it on cancel.
+    """
+    if pause_event is None:
+        pause_event = Pause()
+    if cancel_event is None:
+        cancel_event = threading.Event()
+    own_pool = pool is None
+    if own_pool:
+        pool = FTPConnectionPool(host, user, passwd, port=port, size=streams)
+
+    def _single() -> bool:
+        try:
+            with pool.connection() as ftp:
+                if on_conn:
+                    on_conn(ftp, True)
+                try:
+                    ok = download_file_with_progress(ftp, remote_path, local_path, pause_event,
+                                                     cancel_event, progress_callback, total=total)
+                finally:
+                    if on_conn:
+                        on_conn(ftp, False)
+                if not ok:
+                    pool.discard(ftp)
+                return ok
+        except Exception:
+            return False
+
+    try:
+        if total is None:
+            try:
+                with pool.connection() as ftp:
+                    ftp.voidcmd("TYPE I")
+                    total = ftp.size(remote_path)
+            except Exception:
+                total = None
+        streams = min(streams, pool.size)
+        if streams <= 1 or not total or total < streams:
+            return _single()
+        ok = _fetch_segments(pool, remote_path, local_path, total, streams,
+                             pause_event, cancel_event, progress_callback, on_conn)
+        return _single() if ok is None else ok
+    finally:
+        if own_pool:
+            pool.close()
+
+def _fetch_segments(pool: FTPConnectionPool, remote_path: str, local_path: str, total: int,
+                    streams: int, pause_event, cancel_event: threading.Event,
+                    progress_callback, on_conn=None) -> Optional[bool]:
+    # True on success, False on failure, None if the caller should use one stream
+    fname = os.path.basename(remote_path)
+    received = 0
+    last_report = 0
+    last_ts = time.monotonic()
+    lock = threading.Lock()
+    stop = threading.Event()
 
-            ftp.retrbinary(f"RETR {remote_file}", _callback, blocksize=chunk_size)
+    def _on_bytes(n: int) -> None:
+        nonlocal received, last_report, last_ts
+        with lock:
+            received += n
+            now = time.monotonic()
+            if not progress_callback:
+                return
+            if received - last_report < _PROGRESS_BYTES and now - last_ts <= _PROGRESS_INTERVAL:
+                return
+            last_report = received
+            last_ts = now
+            done = received
+        try:
+            progress_callback(done, total, fname)
+        except Exception:
+            pass
+
+    try:
+        _safe_makedirs(os.path.dirname(local_path) or ".")
+        # size the file up front so every segment writes in place; truncate()
+        # leaves it sparse (posix_fallocate would write every block on
+        # filesystems where glibc has to emulate it)
+        with open(local_path, "wb") as f:
+            f.truncate(total)
+
+        step = -(-total // streams)
+        ranges = [(off, min(step, total - off)) for off in range(0, total, step)]
+        with ThreadPoolExecutor(max_workers=len(ranges)) as ex:
+            futs = [ex.submit(_fetch_segment, pool, remote_path, local_path,
+                              off, length, pause_event, cancel_event, stop, _on_bytes, on_conn)
+                    for off, length in ranges]
+            # one failed segment sinks the file; stop the others as soon as it fails
+            wait(futs, return_when=FIRST_EXCEPTION)
+            stop.set()
+        errors = [e for e in (fut.exception() for fut in futs) if e]
+        if errors:
+            raise next((e for e in errors if isinstance(e, _SegmentsUnavailable)), errors[0])
+        if progress_callback and received != last_report:
+            try:
+                progress_callback(received, total, fname)
+            except Exception:
+                pass
         return True
+    except _SegmentsUnavailable:
+        if cancel_event.is_set() or _cancel_global:
+            return False
+        return None
     except Exception:
         try:
             if os.path.exists(local_path):
@@ -125,15 +774,16 @@ def download_file_with_progress(
             pass
         return False
 
-def build_possible_paths(base_path: str, date_obj: datetime) -> List[str]:
+def build_possible_paths(base_path: str, date_obj: date) -> List[str]:
     """
     Build candidate remote paths for a given date.
     Returns list in preferred order (try first to last).
     """
-    yyyy = date_obj.strftime("%Y")
-    mm = date_obj.strftime("%m")
-    dd = date_obj.strftime("%d")
-    ddmmyyyy = date_obj.strftime("%d%m%Y")
+    # plain formatting is much cheaper than strftime
+    yyyy = f"{date_obj.year:04d}"
+    mm = f"{date_obj.month:02d}"
+    dd = f"{date_obj.day:02d}"
+    ddmmyyyy = f"{dd}{mm}{yyyy}"
     base = base_path.rstrip("/")
     # Two common variants
     p1 = f"{base}/{yyyy}/{mm}/{dd}/"
@@ -149,28 +799,27 @@ def build_possible_paths(base_path: str, date_obj: datetime) -> List[str]:
             out.append(p)
     return out
 
-def find_existing_remote_path(ftp: ftplib.FTP, base_path: str, date_obj: datetime) -> Optional[str]:
+def find_existing_remote_path(ftp: FTPSession, base_path: str, date_obj: date) -> Optional[str]:
     """
     Try candidate remote paths and return the first one that exists (cwd succeeds).
+    Only a permanent (5xx) CWD reply counts as "missing"; connection errors are
+    raised so a dead connection is not mistaken for an absent folder.
     """
     for candidate in build_possible_paths(base_path, date_obj):
         try:
-            ftp.cwd(candidate)
-            # ensure we are in that folder (some servers change)
-            try:
-                pwd = ftp.pwd()
-            except Exception:
-                pass
+            ftp.cwd_if_needed(candidate)
             return candidate
-        except Exception:
+        except ftplib.error_perm:
             continue
     return None
 
-def matches_station_file(filename: str, station_code: str) -> bool:
-    # Must start with station code and end with .txt (case-insensitive)
-    if not filename.lower().endswith(".txt"):
-        return False
-    return filename.startswith(station_code)
+def make_station_scanner(station_code: str) -> Callable[[str], List[str]]:
+    """
+    Station filter for a whole newline-joined listing: returns every name
+    that starts with station_code (case-sensitive) and ends with .txt
+    (any case), in a single regex scan.
+    """
+    return re.compile(r"(?m)^(" + re.escape(station_code) + r"[^/\n]*\.[tT][xX][tT])$").findall
 
 def _iter_range_datetimes(start_dt: datetime, end_dt: datetime, step_minutes: int = 15):
     cur = start_dt
@@ -190,153 +839,249 @@ def download_files_by_prefix(
         local_base: str = "downloads",
         state: str = "",
         port: int = 21,
-        pause_event: Optional[threading.Event] = None,
+        pause_event: Optional[Pause] = None,
         cancel_event: Optional[threading.Event] = None,
         progress_callback: Optional[Callable[[int, Optional[int], str], None]] = None,
         test_mode: bool = False,
-        retries: int = 3
+        retries: int = 3,
+        pool_size: int = 4,
+        pool: Optional[FTPConnectionPool] = None,
+        streams: int = 1
     ) -> Tuple[List[str], List[str]]:
     """
     High-level downloader that:
-    - For each datetime in range (by step_minutes) determines the appropriate remote folder
-      automatically by trying multiple folder patterns.
+    - For each day in range determines the appropriate remote folder automatically by
+      trying multiple folder patterns (step_minutes is kept for compatibility; folders are per day).
     - In each found folder, lists files and downloads those that start with station_id and end with .txt.
     - Saves to local_base/state/station_id/YYYY/MM/DD/<file>
     - Skips download if local file already exists.
+    - Retrieves up to pool_size files concurrently, each over its own FTP connection.
+    - Pass a shared `pool` when downloading several stations from the same server so
+      connections, resolved folders and listings are reused (the caller closes it).
+    - With streams > 1, files of at least _SEGMENT_MIN bytes are split across that many
+      connections of the pool (see download_file_parallel).
     """
     if pause_event is None:
-        pause_event = threading.Event()
+        pause_event = Pause()
     if cancel_event is None:
         cancel_event = threading.Event()
 
     downloaded = []
     failed = []
 
-    ftp = ftp_connect(host, user, passwd, port=port, retries=retries)
-
-    # Build datetimes list by day/time window
-    wanted_dt_list = []
-    cur_day = start_dt.date()
-    while cur_day <= end_dt.date():
-        start_dt_day = datetime(cur_day.year, cur_day.month, cur_day.day, start_hour, start_min)
-        end_dt_day = datetime(cur_day.year, cur_day.month, cur_day.day, end_hour, end_min)
-        cur = start_dt_day
-        while cur <= end_dt_day:
-            wanted_dt_list.append(cur)
-            cur += timedelta(minutes=step_minutes)
-        cur_day = (datetime(cur_day.year, cur_day.month, cur_day.day) + timedelta(days=1)).date()
-
-    if not wanted_dt_list:
-        try:
-            ftp.quit()
-        except Exception:
-            pass
+    # folders may have been removed since the last run
+    with _mkdir_lock:
+        _mkdir_cache.clear()
+
+    # Remote folders are per day, so walk days directly rather than every
+    # step_minutes slot of the daily time window (an empty window means no slots).
+    first_day = start_dt.date()
+    n_days = (end_dt.date() - first_day).days + 1
+    if n_days <= 0 or (start_hour, start_min) > (end_hour, end_min):
         return downloaded, failed
 
-    # For optimization, group by date (we want each date folder only once)
-    dates_seen = set()
+    own_pool = pool is None
+    if own_pool:
+        pool = FTPConnectionPool(host, user, passwd, port=port, size=pool_size, retries=retries)
 
-    for dt in wanted_dt_list:
-        if cancel_event.is_set() or _cancel_global:
-            break
-        date_key = (dt.year, dt.month, dt.day)
-        if date_key in dates_seen:
-            continue
-        dates_seen.add(date_key)
+    # connections this call is transferring on; a shared pool may be busy for others too
+    active = set()
+    active_lock = threading.Lock()
 
-        # find which remote path exists for this date
-        remote_path = find_existing_remote_path(ftp, remote_dir_base, dt)
-        if not remote_path:
-            # not found; continue
-            continue
+    def _track(ftp: FTPSession, busy: bool) -> None:
+        with active_lock:
+            if busy:
+                active.add(ftp)
+            else:
+                active.discard(ftp)
 
-        # list files in that folder
-        try:
-            files = []
+    def _download_one(remote_path: str, fname: str, local_path: str, total: Optional[int]) -> Optional[bool]:
+        # None means the task was skipped because the run was cancelled
+        if cancel_event.is_set() or _cancel_global:
+            return None
+        if streams > 1 and total is not None and total >= _SEGMENT_MIN:
+            return download_file_parallel(host, user, passwd, f"{remote_path.rstrip('/')}/{fname}",
+                                          local_path, streams=streams, port=port,
+                                          pause_event=pause_event, cancel_event=cancel_event,
+                                          progress_callback=progress_callback, total=total, pool=pool,
+                                          on_conn=_track)
+        errors = []
+        ok = _retrieve(remote_path, fname, local_path, total, False, errors)
+        if (not ok and errors and not (cancel_event.is_set() or _cancel_global)
+                and isinstance(errors[-1], (EOFError, ConnectionError, socket.timeout, ftplib.error_temp))):
+            # the server may have dropped an idle pooled connection sooner than
+            # _STALE_AFTER; try once more on a connection known to be alive
+            # (a 550 or a local error would only fail again)
+            ok = _retrieve(remote_path, fname, local_path, total, True)
+        return ok
+
+    def _retrieve(remote_path: str, fname: str, local_path: str, total: Optional[int], check: bool,
+                  errors: Optional[List[Exception]] = None) -> bool:
+        with pool.connection(check) as ftp:
+            _track(ftp, True)
             try:
-                files = ftp.nlst(remote_path)
-            except Exception:
-                # try cwd then nlst
                 try:
-                    ftp.cwd(remote_path)
-                    files = ftp.nlst()
+                    # ensure cwd to remote folder to use simple filename RETR
+                    # (no round-trip if this connection is already there)
+                    ftp.cwd_if_needed(remote_path)
+                    remote_file = fname
                 except Exception:
-                    files = []
-        except Exception:
-            files = []
+                    # fallback to retrieving using full path
+                    remote_file = f"{remote_path.rstrip('/')}/{fname}"
+                ok = download_file_with_progress(ftp, remote_file, local_path, pause_event, cancel_event,
+                                                 progress_callback, total=total, errors=errors)
+            finally:
+                _track(ftp, False)
+            if not ok:
+                # an aborted RETR leaves the control channel in an unknown state
+                pool.discard(ftp)
+            return ok
+
+    scan_station = make_station_scanner(station_id)
 
-        # iterate matching files
-        for fname in files:
+    finished = threading.Event()
+
+    def _watch_cancel():
+        # a transfer blocked in recv() never reaches the per-chunk cancel check,
+        # so abort in-flight transfers as soon as the run is cancelled
+        while not finished.wait(0.2):
             if cancel_event.is_set() or _cancel_global:
-                break
-            # some NLST returns full path, normalize to basename
-            base_fname = os.path.basename(fname)
-            if not matches_station_file(base_fname, station_id):
-                continue
-            # build local path: local_base/State/StationID/YYYY/MM/DD/<filename>
-            yyyy = dt.strftime("%Y")
-            mm = dt.strftime("%m")
-            dd = dt.strftime("%d")
-            local_dir = os.path.join(local_base, (state or "").strip(), station_id, yyyy, mm, dd)
-            _safe_makedirs(local_dir)
-            local_path = os.path.join(local_dir, base_fname)
-            # skip if exists
-            if os.path.exists(local_path):
-                downloaded.append(local_path)  # mark as already present
+                with active_lock:
+                    busy = list(active)
+                for ftp in busy:
+                    ftp.abort_transfer()
+                if isinstance(pause_event, Pause):
+                    pause_event.wake()
+                return
+
+    threading.Thread(target=_watch_cancel, daemon=True).start()
+
+    # Pipeline: the lister thread resolves and lists upcoming days (at most two
+    # ahead) while this thread filters and queues downloads on the pool.
+    listing_q = queue.Queue(maxsize=2)
+
+    def _put(item) -> bool:
+        # give up if the consumer has already left
+        while not finished.is_set():
+            try:
+                listing_q.put(item, timeout=0.2)
+                return True
+            except queue.Full:
                 continue
-            # If test mode, create dummy file
-            if test_mode:
-                try:
-                    with open(local_path, "w", encoding="utf-8") as fh:
-                        fh.write(f"TEST-DUMMY for {base_fname}\n")
-                    downloaded.append(local_path)
+        return False
+
+    def _lister():
+        try:
+            for offset in range(n_days):
+                if cancel_event.is_set() or _cancel_global:
+                    break
+                day = first_day + timedelta(days=offset)
+                # find which remote path exists for this date
+                remote_path = pool.resolve_path(remote_dir_base, day)
+                if not remote_path:
+                    # not found; continue
                     continue
-                except Exception:
-                    failed.append(f"{remote_path}/{base_fname}")
+                # list files in that folder
+                if not _put((day, remote_path, pool.list_dir(remote_path))):
+                    return
+        except Exception as e:
+            # e.g. ConnectionError: re-raised by the consumer below
+            _put(e)
+        _put(None)
+
+    threading.Thread(target=_lister, daemon=True).start()
+    # future -> (remote_path, filename, local_path); results are collected on this thread
+    pending = {}
+
+    try:
+        with ThreadPoolExecutor(max_workers=pool.size) as executor:
+            while True:
+                item = listing_q.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if cancel_event.is_set() or _cancel_global:
+                    # keep draining until the lister notices the cancel
                     continue
-            # perform download
-            try:
-                # ensure cwd to remote folder to use simple filename RETR
+                dt, remote_path, files = item
+
+                # iterate matching files
+                # one regex pass over the joined names instead of a Python-level
+                # test per listing entry; only the matches are looked up again
+                facts_by_name = dict(files)
+                wanted = [(fname, facts_by_name[fname]) for fname in scan_station("\n".join(facts_by_name))]
+                if not wanted:
+                    continue
+                # build local dir: local_base/State/StationID/YYYY/MM/DD/
+                yyyy, mm, dd = f"{dt.year:04d}", f"{dt.month:02d}", f"{dt.day:02d}"
+                local_dir = os.path.join(local_base, (state or "").strip(), station_id, yyyy, mm, dd)
+                _safe_makedirs(local_dir)
+                # one directory scan instead of a stat() per candidate file
                 try:
-                    ftp.cwd(remote_path)
-                    ok = download_file_with_progress(ftp, base_fname, local_path, pause_event, cancel_event, progress_callback)
-                except Exception:
-                    # fallback to retrieving using full path
-                    ok = download_file_with_progress(ftp, f"{remote_path.rstrip('/')}/{base_fname}", local_path, pause_event, cancel_event, progress_callback)
-                if ok:
-                    downloaded.append(local_path)
-                else:
-                    failed.append(f"{remote_path}/{base_fname}")
+                    with os.scandir(local_dir) as it:
+                        existing = {entry.name for entry in it}
+                except OSError:
+                    existing = set()
+                for base_fname, facts in wanted:
+                    if cancel_event.is_set() or _cancel_global:
+                        break
+                    local_path = os.path.join(local_dir, base_fname)
+                    # skip if exists
+                    if base_fname in existing:
+                        downloaded.append(local_path)  # mark as already present
+                        continue
+                    # If test mode, create dummy file
+                    if test_mode:
+                        try:
+                            with open(local_path, "w", encoding="utf-8") as fh:
+                                fh.write(f"TEST-DUMMY for {base_fname}\n")
+                            downloaded.append(local_path)
+                            continue
+                        except Exception:
+                            failed.append(f"{remote_path}/{base_fname}")
+                            continue
+                    # size from MLSD facts, if the server provided it
+                    size = facts.get("size", "")
+                    total = int(size) if size.isdigit() else None
+                    # queue download on the connection pool
+                    fut = executor.submit(_download_one, remote_path, base_fname, local_path, total)
+                    pending[fut] = (remote_path, base_fname, local_path)
+
+        for fut, (remote_path, base_fname, local_path) in pending.items():
+            try:
+                ok = fut.result()
             except Exception:
+                ok = False
+            if ok is None:
+                continue
+            if ok:
+                downloaded.append(local_path)
+            else:
                 failed.append(f"{remote_path}/{base_fname}")
-                # remove partial maybe handled in download_file_with_progress
-
-    try:
-        ftp.quit()
-    except Exception:
-        pass
+    finally:
+        finished.set()
+        if own_pool:
+            pool.close()
 
     return downloaded, failed
 
 def download_single_by_path(host: str, user: str, passwd: str,
                             remote_file: str, local_file: str,
                             port: int = 21,
-                            pause_event: Optional[threading.Event] = None,
+                            pause_event: Optional[Pause] = None,
                             cancel_event: Optional[threading.Event] = None,
                             progress_callback: Optional[Callable[[int, Optional[int], str], None]] = None,
                             retries: int = 3) -> bool:
     if pause_event is None:
-        pause_event = threading.Event()
+        pause_event = Pause()
     if cancel_event is None:
         cancel_event = threading.Event()
 
-    ftp = ftp_connect(host, user, passwd, port=port, retries=retries)
-    try:
+    # reuse an idle login to this server when there is one
+    pool = get_pool(host, user, passwd, port=port, retries=retries)
+    with pool.connection() as ftp:
         ok = download_file_with_progress(ftp, remote_file, local_file, pause_event, cancel_event, progress_callback)
-        try:
-            ftp.quit()
-        except Exception:
-            pass
+        if not ok:
+            pool.discard(ftp)
         return ok
-    finally:
-        pass
\ No newline at end of file
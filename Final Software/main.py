@@ -8,16 +8,21 @@ Features added:
 - Per-server independent settings persisted in settings.json
 - Preview Remote Dir per server
 - Global "Enable Auto Midnight Download (00:10)" checkbox
-- Scheduler (uses `schedule` if available); runs downloads for all servers simultaneously
+- Scheduler (uses `schedule` if available); runs downloads for all servers in parallel,
+  at most `max_parallel_servers` (settings.json, default 4) at a time
 - Save All Settings button in Main tab to persist UI fields back to settings.json
 - Settings tab supports editing host/port/user/pass/remote for each server
 """
 
 import os
 import json
+import queue
+import atexit
 import threading
-import time
 import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime, date, timedelta
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
@@ -36,18 +41,123 @@ except Exception:
     schedule = None
     SCHEDULE_AVAILABLE = False
 
-from downloader import download_files_by_prefix, ftp_connect, download_single_by_path
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except Exception:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+from downloader import download_files_by_prefix, ftp_connect, download_single_by_path, Pause, set_global_cancel, get_pool, list_entries
 
 SETTINGS_FILE = "settings.json"
 HISTORY_FILE = "download_history.log"
 PAD = {"padx": 6, "pady": 6}
+PROGRESS_POLL_MS = 50  # status labels refresh at ~20 Hz however fast workers report
+PARALLEL_STREAMS = 4   # connections per large file when "Parallel streams" is ticked
+SAVE_DEBOUNCE_MS = 500 # station edits are written to settings.json at most this late
+PREVIEW_CHUNK = 256    # directory preview lines per Text insert
+PREVIEW_LIMIT = 1000   # directory preview shows at most this many entries
+SCHEDULER_MAX_SLEEP = 300  # re-check the wall clock at least this often (suspend, clock changes)
+HISTORY_TAIL_BYTES = 200_000  # the History tab shows only the end of the log
+
+# download parameters shared by manual and scheduled runs (whole day, every folder)
+RUN_DEFAULTS = {
+    "start_hour": 0,
+    "start_min": 0,
+    "end_hour": 23,
+    "end_min": 55,
+    "step_minutes": 15,
+    "single_ts": "",
+    "test_mode": False
+}
+
+
+# History lines are queued and written by one background thread, so workers
+# never block on file I/O; bursts are written as one batch.
+_log_q = queue.Queue()
+_LOG_BATCH = 128
 
 
 def append_history(line: str):
-    os.makedirs(os.path.dirname(HISTORY_FILE) or ".", exist_ok=True)
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(HISTORY_FILE, "a", encoding="utf-8") as fh:
-        fh.write(f"[{ts}] {line}\n")
+    _log_q.put((datetime.now(), line))
+
+
+def flush_history():
+    """Block until every queued history line has been written."""
+    _log_q.join()
+
+
+def clear_history():
+    """Empty the history log; queued after (and so discarding) earlier lines."""
+    _log_q.put(None)
+    _log_q.join()
+
+
+def _history_writer():
+    fh = None
+    while True:
+        batch = [_log_q.get()]
+        while len(batch) < _LOG_BATCH:
+            try:
+                batch.append(_log_q.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            if fh is None:
+                os.makedirs(os.path.dirname(HISTORY_FILE) or ".", exist_ok=True)
+                fh = open(HISTORY_FILE, "a", encoding="utf-8")
+            lines = []
+            for item in batch:
+                if item is None:
+                    # clear request: truncate through the handle we keep open
+                    lines.clear()
+                    fh.truncate(0)
+                else:
+                    lines.append(f"[{item[0]:%Y-%m-%d %H:%M:%S}] {item[1]}\n")
+            fh.writelines(lines)
+            fh.flush()
+        except Exception:
+            fh = None
+        finally:
+            for _ in batch:
+                _log_q.task_done()
+
+
+threading.Thread(target=_history_writer, daemon=True).start()
+atexit.register(flush_history)
+
+
+def validate_and_build(snapshot: dict):
+    """
+    Turn a plain-dict snapshot of a server tab into download params.
+    No Tk and no I/O, so it can run on any thread.
+    Returns (params, stations, None) or (None, None, error message).
+    """
+    stations = snapshot["stations"]
+    if not stations:
+        return None, None, "Add at least one station"
+    try:
+        days = []
+        for d in (snapshot["start"], snapshot["end"]):
+            # DateEntry gives a date, the plain Entry fallback a string
+            if isinstance(d, str):
+                days.append(datetime.strptime(d.strip(), "%Y-%m-%d"))
+            else:
+                days.append(datetime(d.year, d.month, d.day))
+    except Exception as e:
+        return None, None, f"Invalid date: {e}"
+
+    params = {
+        **RUN_DEFAULTS,
+        "start_dt": days[0],
+        "end_dt": days[1],
+        "local_folder": snapshot["folder"],
+        "state": snapshot["state"],
+        "single_ts": snapshot["single_ts"].strip(),
+        "streams": PARALLEL_STREAMS if snapshot["parallel_streams"] else 1
+    }
+    return params, stations, None
 
 
 class ServerController:
@@ -56,11 +166,27 @@ class ServerController:
         self.server_index = server_index
         self.cfg = server_cfg
         self.thread = None
-        self.pause_event = threading.Event()
+        self.pause_event = Pause()
         self.cancel_event = threading.Event()
         self.running = False
         self.ui_update_fn = ui_update_fn
         self.last_result = None
+        # latest status from the worker thread; painted by pump() on the Tk thread
+        self._status = deque(maxlen=1)
+        # log in ahead of time so the first download skips the login round-trips
+        if server_cfg.get("host"):
+            threading.Thread(target=self._prewarm, daemon=True).start()
+
+    def _pool(self):
+        return get_pool(self.cfg.get("host"), self.cfg.get("user", ""), self.cfg.get("pass", ""),
+                        port=int(self.cfg.get("port", 21)))
+
+    def _prewarm(self):
+        try:
+            with self._pool().connection():
+                pass
+        except Exception:
+            pass  # the download will report connection problems
 
     def start_download(self, stations, params):
         if self.running:
@@ -81,6 +207,10 @@ class ServerController:
         remote_base = self.cfg.get("remote", "/")
 
         append_history(f"Server {host}:{port} - start downloads")
+        # stations share the server's pooled connections; folders are re-resolved
+        # and re-listed once per run
+        pool = self._pool()
+        pool.clear_cache()
         try:
             total_downloaded = 0
             total_failed = 0
@@ -104,7 +234,7 @@ class ServerController:
                         start_dt = single_dt
                         end_dt = single_dt
                     except Exception as e:
-                        self.ui_update_fn(self.server_index, f"Invalid single timestamp: {e}", None, None)
+                        self._status.append(f"Invalid single timestamp: {e}")
                         append_history(f"{host}: invalid single_ts {single_ts} -> {e}")
                         continue
                 else:
@@ -112,7 +242,7 @@ class ServerController:
                     end_dt = params["end_dt"]
 
                 def cb(received, total, filename):
-                    self.ui_update_fn(self.server_index, f"{filename} {received}/{total or '?'}", None, None)
+                    self._status.append((filename, received, total))
 
                 downloaded, failed = download_files_by_prefix(
                     host, user, pwd, remote_base, station,
@@ -128,23 +258,40 @@ class ServerController:
                     pause_event=self.pause_event,
                     cancel_event=self.cancel_event,
                     progress_callback=cb,
-                    test_mode=params.get("test_mode", False)
+                    test_mode=params.get("test_mode", False),
+                    pool=pool,
+                    streams=params.get("streams", 1)
                 )
 
                 total_downloaded += len(downloaded)
                 total_failed += len(failed)
-                self.ui_update_fn(self.server_index, f"Station {station}: {len(downloaded)} ok, {len(failed)} failed", None, None)
+                self._status.append(f"Station {station}: {len(downloaded)} ok, {len(failed)} failed")
                 append_history(f"{host}: station {station} -> {len(downloaded)} ok, {len(failed)} failed")
 
-            self.ui_update_fn(self.server_index, f"Completed: {total_downloaded} ok, {total_failed} failed", None, None)
+            self._status.append(f"Completed: {total_downloaded} ok, {total_failed} failed")
             append_history(f"{host}: completed: {total_downloaded} ok, {total_failed} failed")
             self.last_result = (total_downloaded, total_failed)
         except Exception as e:
-            self.ui_update_fn(self.server_index, f"Error: {e}", None, None)
+            self._status.append(f"Error: {e}")
             append_history(f"{host}: error: {e}\n{traceback.format_exc()}")
         finally:
             self.running = False
 
+    def post_status(self, text):
+        """Queue a status line for the Tk thread (safe from any thread)."""
+        self._status.append(text)
+
+    def pump(self):
+        """Paint the most recent worker status; call from the Tk thread."""
+        try:
+            item = self._status.popleft()
+        except IndexError:
+            return
+        if isinstance(item, tuple):
+            filename, received, total = item
+            item = f"{filename} {received}/{total or '?'}"
+        self.ui_update_fn(self.server_index, item, None, None)
+
     def pause(self):
         self.pause_event.set()
         append_history(f"Paused {self.cfg.get('host')}")
@@ -155,6 +302,7 @@ class ServerController:
 
     def cancel(self):
         self.cancel_event.set()
+        self.pause_event.wake()  # paused downloads notice the cancel right away
         append_history(f"Cancelled {self.cfg.get('host')}")
 
 
@@ -170,11 +318,23 @@ class FTPDownloaderApp:
 
         self.scheduler_thread = None
         self.scheduler_stop_event = threading.Event()
+        self._job_thread = None  # the nightly run, off the scheduler thread
         self.auto_midnight_enabled = False
+        self.max_parallel_servers = 4  # scheduled runs: servers transferring at once
+
+        # blocking FTP calls made on behalf of the UI (previews) run here, never on the Tk thread
+        self._io_pool = ThreadPoolExecutor(max_workers=8)
+        # download parameter checks get their own worker so slow previews can't delay them
+        self._validate_pool = ThreadPoolExecutor(max_workers=1)
+        self._previews_pending = set()  # hosts with a preview in flight
+        self._save_pending = False
+        self._saved_bytes = None  # settings.json content as last read or written
 
         self._load_settings()
         self._build_ui()
         self._apply_settings_to_ui()
+        self.root.after(PROGRESS_POLL_MS, self._pump_progress)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # start scheduler if enabled and schedule available
         if self.auto_midnight_enabled and SCHEDULE_AVAILABLE:
@@ -188,24 +348,72 @@ class FTPDownloaderApp:
             self.servers = []
             return
         try:
-            with open(SETTINGS_FILE, "r", encoding="utf-8") as fh:
-                cfg = json.load(fh)
-                self.servers = cfg.get("servers", [])
-                self.auto_midnight_enabled = cfg.get("auto_midnight", False)
+            with open(SETTINGS_FILE, "rb") as fh:
+                data = fh.read()
+            cfg = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+            self._saved_bytes = data
+            self.servers = cfg.get("servers", [])
+            self.auto_midnight_enabled = cfg.get("auto_midnight", False)
         except Exception:
             self.servers = []
             self.auto_midnight_enabled = False
+            return
+        # parsed on its own: a bad value must not discard the server list
+        try:
+            self.max_parallel_servers = max(1, int(cfg.get("max_parallel_servers", 4)))
+        except (TypeError, ValueError):
+            self.max_parallel_servers = 4
 
-    def _save_settings(self):
+    def _write_settings(self):
         cfg = {
             "servers": self.servers,
-            "auto_midnight": self.auto_midnight_enabled
+            "auto_midnight": self.auto_midnight_enabled,
+            "max_parallel_servers": self.max_parallel_servers
         }
-        with open(SETTINGS_FILE, "w", encoding="utf-8") as fh:
-            json.dump(cfg, fh, indent=2)
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(cfg, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(cfg, indent=2).encode("utf-8")
+        if data == self._saved_bytes:
+            # nothing changed since the last write; skip the disk I/O
+            return
+        # write a temp file and swap it in, so a crash never leaves half a settings.json
+        tmp = SETTINGS_FILE + ".tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, SETTINGS_FILE)
+        self._saved_bytes = data
+
+    def _save_settings(self):
+        self._save_pending = False  # this write covers any debounced one
+        self._write_settings()
         append_history("Settings saved.")
         messagebox.showinfo("Settings", "Settings saved.")
 
+    def _schedule_save(self):
+        # coalesce bursts of edits (e.g. adding many stations) into one silent write
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self.root.after(SAVE_DEBOUNCE_MS, self._flush_save)
+
+    def _flush_save(self):
+        if not self._save_pending:
+            return
+        self._save_pending = False
+        self._write_settings()
+
+    def _on_close(self):
+        self._flush_save()
+        # transfer workers are not daemon threads, so interpreter exit waits for
+        # them: cancel every run (a paused one would otherwise wait forever)
+        set_global_cancel(True)
+        for ctrl in list(self.controllers.values()):
+            if ctrl.running:
+                ctrl.cancel()
+        self.stop_scheduler()
+        self.root.destroy()
+
     # -------------------------
     # UI build
     # -------------------------
@@ -288,9 +496,9 @@ class FTPDownloaderApp:
     # -------------------------
     def _refresh_server_listbox(self):
         self.server_listbox.delete(0, 'end')
-        for s in self.servers:
-            label = f"{s.get('host')}:{s.get('port', 21)}"
-            self.server_listbox.insert('end', label)
+        # one Tcl call for all rows instead of one per server
+        labels = [f"{s.get('host')}:{s.get('port', 21)}" for s in self.servers]
+        self.server_listbox.insert('end', *labels)
 
     def _settings_add_server(self):
         host = simpledialog.askstring("Add Server", "Enter host:")
@@ -365,14 +573,27 @@ class FTPDownloaderApp:
         port = int(s.get("port", 21))
         user = s.get("user", "")
         pwd = s.get("pass", "")
+        # a fresh login on the I/O pool: tests the credentials, never blocks the Tk thread
+        fut = self._io_pool.submit(self._do_test_connect, host, user, pwd, port)
+        fut.add_done_callback(lambda f: self.root.after(0, self._show_test_result, host, port, f))
+
+    @staticmethod
+    def _do_test_connect(host, user, pwd, port):
+        ftp = ftp_connect(host, user, pwd, port=port, retries=2)
         try:
-            ftp = ftp_connect(host, user, pwd, port=port, retries=2)
             ftp.quit()
-            messagebox.showinfo("OK", f"Connected to {host}:{port} successfully")
-            append_history(f"Connected to {host}:{port}")
+        except Exception:
+            ftp.close()
+
+    def _show_test_result(self, host, port, fut):
+        try:
+            fut.result()
         except Exception as e:
             messagebox.showerror("Failed", f"Connect failed: {e}")
             append_history(f"Connect failed to {host}:{port} -> {e}")
+            return
+        messagebox.showinfo("OK", f"Connected to {host}:{port} successfully")
+        append_history(f"Connected to {host}:{port}")
 
     def _preview_remote_for_selected(self):
         sel = self.server_listbox.curselection()
@@ -413,20 +634,21 @@ class FTPDownloaderApp:
         ttk.Label(parent, text="Local Folder:").grid(row=2, column=0, sticky="w", **PAD)
         ui["folder_var"] = tk.StringVar(value=server_cfg.get("local_folder", os.path.join(os.getcwd(), "downloads")))
         tk.Entry(parent, textvariable=ui["folder_var"], width=60).grid(row=2, column=1, sticky="w", **PAD)
-        ttk.Button(parent, text="Browse", command=lambda u=ui: self._browse_folder(u)).grid(row=2, column=2, **PAD)
+        ttk.Button(parent, text="Browse", command=partial(self._browse_folder, ui)).grid(row=2, column=2, **PAD)
 
         # Stations
         station_frame = ttk.LabelFrame(parent, text="Stations")
         station_frame.grid(row=3, column=0, columnspan=3, sticky="ew", **PAD)
-        ui["station_list"] = tk.Listbox(station_frame, height=6)
+        # a plain view of server_cfg["stations"]; rows carry no data of their own
+        ui["station_list"] = ttk.Treeview(station_frame, show="tree", selectmode="browse", height=6)
         ui["station_list"].pack(side="left", fill="y", padx=4, pady=4)
         for st in server_cfg.get("stations", []):
-            ui["station_list"].insert("end", st)
+            ui["station_list"].insert("", "end", text=st)
 
         st_entry = tk.Entry(station_frame, width=20)
         st_entry.pack(side="left", padx=4)
-        ttk.Button(station_frame, text="Add", command=lambda u=ui, e=st_entry, i=idx: self._add_station(u, e, i)).pack(side="left", padx=4)
-        ttk.Button(station_frame, text="Remove", command=lambda u=ui, i=idx: self._remove_station(u, i)).pack(side="left", padx=4)
+        ttk.Button(station_frame, text="Add", command=partial(self._add_station, ui, st_entry, idx)).pack(side="left", padx=4)
+        ttk.Button(station_frame, text="Remove", command=partial(self._remove_station, ui, idx)).pack(side="left", padx=4)
 
         # Date selection
         row = 4
@@ -443,16 +665,18 @@ class FTPDownloaderApp:
         ttk.Label(parent, text="Single file (YYMMDDHHMM):").grid(row=row, column=0, sticky="w", **PAD)
         ui["single_ts"] = tk.Entry(parent, width=20)
         ui["single_ts"].grid(row=row, column=1, sticky="w", **PAD)
+        ui["streams_var"] = tk.IntVar(value=1 if server_cfg.get("parallel_streams") else 0)
+        ttk.Checkbutton(parent, text="Parallel streams", variable=ui["streams_var"]).grid(row=row, column=2, sticky="w", **PAD)
 
         # Controls: Download / Pause / Resume / Cancel / Preview Remote Dir
         row += 1
         btn_frame = ttk.Frame(parent)
         btn_frame.grid(row=row, column=0, columnspan=3, sticky="w", **PAD)
-        ttk.Button(btn_frame, text="Download", command=lambda i=idx: self._start_download(i)).pack(side="left", padx=4)
-        ttk.Button(btn_frame, text="Pause", command=lambda i=idx: self._pause_server(i)).pack(side="left", padx=4)
-        ttk.Button(btn_frame, text="Resume", command=lambda i=idx: self._resume_server(i)).pack(side="left", padx=4)
-        ttk.Button(btn_frame, text="Cancel", command=lambda i=idx: self._cancel_server(i)).pack(side="left", padx=4)
-        ttk.Button(btn_frame, text="Preview Remote Dir", command=lambda s=server_cfg: self._preview_remote_dir_for_server(s)).pack(side="left", padx=8)
+        ttk.Button(btn_frame, text="Download", command=partial(self._start_download, idx)).pack(side="left", padx=4)
+        ttk.Button(btn_frame, text="Pause", command=partial(self._pause_server, idx)).pack(side="left", padx=4)
+        ttk.Button(btn_frame, text="Resume", command=partial(self._resume_server, idx)).pack(side="left", padx=4)
+        ttk.Button(btn_frame, text="Cancel", command=partial(self._cancel_server, idx)).pack(side="left", padx=4)
+        ttk.Button(btn_frame, text="Preview Remote Dir", command=partial(self._preview_remote_dir_for_server, server_cfg)).pack(side="left", padx=8)
 
         # Status label
         ui["status_lbl"] = ttk.Label(parent, text="Idle")
@@ -474,76 +698,73 @@ class FTPDownloaderApp:
         val = entry.get().strip()
         if not val:
             return
-        ui["station_list"].insert("end", val)
         self.servers[idx].setdefault("stations", []).append(val)
-        self._save_settings()  # persist immediately
+        ui["station_list"].insert("", "end", text=val)
+        self._schedule_save()
 
     def _remove_station(self, ui, idx):
-        sel = ui["station_list"].curselection()
+        tree = ui["station_list"]
+        sel = tree.selection()
         if not sel:
             return
-        pos = sel[0]
-        val = ui["station_list"].get(pos)
-        ui["station_list"].delete(pos)
-        if val in self.servers[idx].get("stations", []):
-            self.servers[idx]["stations"].remove(val)
-        self._save_settings()
+        pos = tree.index(sel[0])
+        # the tree mirrors self.servers[idx]["stations"] row for row
+        stations = self.servers[idx].get("stations", [])
+        if pos < len(stations):
+            del stations[pos]
+        tree.delete(sel[0])
+        self._schedule_save()
 
     # -------------------------
     # Download control logic
     # -------------------------
-    def _build_params_for_server(self, idx):
+    def _snapshot_server_tab(self, idx):
+        # read the widgets (Tk thread only) into plain values for validate_and_build
         if idx not in self.server_tabs:
-            return None, None
+            return None
         ui = self.server_tabs[idx]
-        state = ui["state_var"].get().strip()
-        folder = ui["folder_var"].get().strip() or os.getcwd()
-        stations = [ui["station_list"].get(i) for i in range(ui["station_list"].size())]
-        if not stations:
-            messagebox.showerror("Error", "Add at least one station")
-            return None, None
-
-        try:
-            if CALENDAR_AVAILABLE:
-                sd = ui["start_date"].get_date()
-                ed = ui["end_date"].get_date()
-                start_dt = datetime(sd.year, sd.month, sd.day)
-                end_dt = datetime(ed.year, ed.month, ed.day)
-            else:
-                start_dt = datetime.strptime(ui["start_date"].get().strip(), "%Y-%m-%d")
-                end_dt = datetime.strptime(ui["end_date"].get().strip(), "%Y-%m-%d")
-        except Exception as e:
-            messagebox.showerror("Error", f"Invalid date: {e}")
-            return None, None
-
-        params = {
-            "start_dt": start_dt,
-            "end_dt": end_dt,
-            "start_hour": 0,
-            "start_min": 0,
-            "end_hour": 23,
-            "end_min": 55,
-            "step_minutes": 15,
-            "local_folder": folder,
-            "state": state,
-            "single_ts": ui["single_ts"].get().strip(),
-            "test_mode": False
+        # self.servers is authoritative; no need to read the listbox back row by row
+        stations = list(self.servers[idx].get("stations", []))
+        assert len(stations) == len(ui["station_list"].get_children()), "station list out of sync"
+        if CALENDAR_AVAILABLE:
+            start, end = ui["start_date"].get_date(), ui["end_date"].get_date()
+        else:
+            start, end = ui["start_date"].get(), ui["end_date"].get()
+        return {
+            "state": ui["state_var"].get().strip(),
+            "folder": ui["folder_var"].get().strip() or os.getcwd(),
+            "stations": stations,
+            "start": start,
+            "end": end,
+            "single_ts": ui["single_ts"].get(),
+            "parallel_streams": bool(ui["streams_var"].get())
         }
-        # update server config and persist
-        self.servers[idx]["state"] = state
-        self.servers[idx]["local_folder"] = folder
-        self.servers[idx]["stations"] = stations
-        self._save_settings()
-        return params, stations
 
     def _start_download(self, idx):
-        params, stations = self._build_params_for_server(idx)
-        if not params:
+        snapshot = self._snapshot_server_tab(idx)
+        if snapshot is None:
             return
-        ctrl = self.controllers.get(idx)
-        if not ctrl:
-            ctrl = ServerController(idx, self.servers[idx], self._server_ui_update)
-            self.controllers[idx] = ctrl
+        fut = self._validate_pool.submit(validate_and_build, snapshot)
+        fut.add_done_callback(lambda f: self.root.after(0, self._on_params_built, idx, snapshot, f))
+
+    def _on_params_built(self, idx, snapshot, fut):
+        try:
+            params, stations, error = fut.result()
+        except Exception as e:
+            params, stations, error = None, None, str(e)
+        if error:
+            messagebox.showerror("Error", error)
+            return
+        # update server config and persist
+        self.servers[idx]["parallel_streams"] = snapshot["parallel_streams"]
+        self.servers[idx]["state"] = snapshot["state"]
+        self.servers[idx]["local_folder"] = snapshot["folder"]
+        self._schedule_save()
+        self._actually_start_download(idx, params, stations)
+
+    def _actually_start_download(self, idx, params, stations):
+        # every server tab creates its controller (_build_server_ui)
+        ctrl = self.controllers[idx]
         ctrl.cfg = self.servers[idx]  # ensure cfg up-to-date
         started = ctrl.start_download(stations, params)
         if started:
@@ -575,49 +796,10 @@ class FTPDownloaderApp:
         if ui:
             ui["status_lbl"].config(text=text)
 
-    # -------------------------
-    # Preview remote directory
-    # -------------------------
-    def _preview_remote_dir_for_server(self, server_cfg):
-        host = server_cfg.get("host")
-        if not host:
-            messagebox.showerror("Error", "Server host not configured")
-            return
-        port = int(server_cfg.get("port", 21))
-        user = server_cfg.get("user", "")
-        pwd = server_cfg.get("pass", "")
-        remote = server_cfg.get("remote", "/")
-
-        try:
-            ftp = ftp_connect(host, user, pwd, port=port, retries=2)
-            files = []
-            try:
-                files = ftp.nlst(remote)
-            except Exception:
-                # try cwd then nlst
-                try:
-                    ftp.cwd(remote)
-                    files = ftp.nlst()
-                except Exception:
-                    # fallback to root listing
-                    try:
-                        files = ftp.nlst()
-                    except Exception:
-                        files = []
-            try:
-                ftp.quit()
-            except Exception:
-                pass
-            preview = "\n".join(files[:1000]) or "(empty)"
-            dlg = tk.Toplevel(self.root)
-            dlg.title(f"Preview {host}:{remote}")
-            txt = tk.Text(dlg, width=100, height=30)
-            txt.insert("1.0", preview)
-            txt.pack(fill="both", expand=True)
-            append_history(f"Previewed remote dir {remote} on {host}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Preview failed: {e}")
-            append_history(f"Preview failed for {host}{remote}: {e}")
+    def _pump_progress(self):
+        for ctrl in list(self.controllers.values()):
+            ctrl.pump()
+        self.root.after(PROGRESS_POLL_MS, self._pump_progress)
 
     # -------------------------
     # Save All Settings (Main)
@@ -629,7 +811,9 @@ class FTPDownloaderApp:
                 continue
             self.servers[idx]["state"] = ui["state_var"].get().strip()
             self.servers[idx]["local_folder"] = ui["folder_var"].get().strip() or os.getcwd()
-            self.servers[idx]["stations"] = [ui["station_list"].get(i) for i in range(ui["station_list"].size())]
+            # stations are kept up to date by _add_station / _remove_station
+            assert len(self.servers[idx].get("stations", [])) == len(ui["station_list"].get_children()), "station list out of sync"
+            self.servers[idx]["parallel_streams"] = bool(ui["streams_var"].get())
             # single_ts / date not persisted (they are momentary)
         self.auto_midnight_enabled = bool(self.auto_var.get())
         self._save_settings()
@@ -645,14 +829,22 @@ class FTPDownloaderApp:
     # History functions
     # -------------------------
     def _load_history(self):
+        flush_history()
         if os.path.exists(HISTORY_FILE):
-            with open(HISTORY_FILE, "r", encoding="utf-8") as fh:
-                self.history_text.delete("1.0", "end")
-                self.history_text.insert("1.0", fh.read())
+            # the log grows without bound; read only its tail
+            with open(HISTORY_FILE, "rb") as fh:
+                size = fh.seek(0, os.SEEK_END)
+                fh.seek(max(0, size - HISTORY_TAIL_BYTES))
+                data = fh.read().decode("utf-8", "replace")
+            if size > HISTORY_TAIL_BYTES:
+                # drop the partial first line
+                data = data.split("\n", 1)[-1]
+            self.history_text.delete("1.0", "end")
+            self.history_text.insert("1.0", data)
 
     def _clear_history(self):
         if messagebox.askyesno("Confirm", "Clear history log?"):
-            open(HISTORY_FILE, "w", encoding="utf-8").close()
+            clear_history()
             self._load_history()
 
     # -------------------------
@@ -675,10 +867,13 @@ class FTPDownloaderApp:
         if not SCHEDULE_AVAILABLE:
             append_history("Schedule not available; cannot start scheduler")
             return
-        if self.scheduler_thread and self.scheduler_thread.is_alive():
+        if (self.scheduler_thread and self.scheduler_thread.is_alive()
+                and not self.scheduler_stop_event.is_set()):
             return
-        self.scheduler_stop_event.clear()
-        self.scheduler_thread = threading.Thread(target=self._scheduler_loop, daemon=True)
+        # a fresh event per loop: a loop that is still stopping keeps its own
+        self.scheduler_stop_event = threading.Event()
+        self.scheduler_thread = threading.Thread(
+            target=self._scheduler_loop, args=(self.scheduler_stop_event,), daemon=True)
         self.scheduler_thread.start()
         append_history("Scheduler started")
 
@@ -688,65 +883,76 @@ class FTPDownloaderApp:
             append_history("Scheduler stopping")
             # don't join here (daemon thread) — it will exit soon
 
-    def _scheduler_loop(self):
+    def _scheduler_loop(self, stop_event):
         # schedule job daily at 00:10
         schedule.clear()
-        schedule.every().day.at("00:10").do(self._scheduled_job)
-        while not self.scheduler_stop_event.is_set():
+        schedule.every().day.at("00:10").do(self._start_scheduled_job)
+        while not stop_event.is_set():
+            # sleep until the next job is due instead of polling every few seconds
+            idle = schedule.idle_seconds()
+            if idle is None or idle > 0:
+                wait = SCHEDULER_MAX_SLEEP if idle is None else min(idle, SCHEDULER_MAX_SLEEP)
+                if stop_event.wait(wait):
+                    break
             try:
                 schedule.run_pending()
             except Exception:
                 pass
-            time.sleep(5)
+
+    def _start_scheduled_job(self):
+        # the run can take hours; keep the scheduler loop responsive to stop/start
+        if self._job_thread and self._job_thread.is_alive():
+            append_history("Scheduled: previous run still in progress; skipped")
+            return
+        self._job_thread = threading.Thread(target=self._scheduled_job, daemon=True)
+        self._job_thread.start()
 
     def _scheduled_job(self):
         # build params for yesterday
         yesterday = date.today() - timedelta(days=1)
+        day = datetime(yesterday.year, yesterday.month, yesterday.day)
+        base = {**RUN_DEFAULTS, "start_dt": day, "end_dt": day}
+        default_folder = os.path.join(os.getcwd(), "downloads")
         params_map = {}
         for idx, s in enumerate(self.servers):
             # load per-server stations/local/state from saved config
-            stations = s.get("stations", [])
-            local_folder = s.get("local_folder", os.path.join(os.getcwd(), "downloads"))
-            state = s.get("state", "")
             params = {
-                "start_dt": datetime(yesterday.year, yesterday.month, yesterday.day),
-                "end_dt": datetime(yesterday.year, yesterday.month, yesterday.day),
-                "start_hour": 0,
-                "start_min": 0,
-                "end_hour": 23,
-                "end_min": 55,
-                "step_minutes": 15,
-                "local_folder": local_folder,
-                "state": state,
-                "single_ts": "",
-                "test_mode": False
+                **base,
+                "local_folder": s.get("local_folder", default_folder),
+                "state": s.get("state", ""),
+                "streams": PARALLEL_STREAMS if s.get("parallel_streams") else 1
             }
-            params_map[idx] = (params, stations)
+            params_map[idx] = (params, s.get("stations", []))
 
-        # Start downloads simultaneously for all servers
+        jobs = []
         for idx, (params, stations) in params_map.items():
             if not stations:
                 append_history(f"Scheduled: no stations configured for server idx {idx}")
                 continue
-            # ensure controller exists
-            ctrl = self.controllers.get(idx)
-            if not ctrl:
-                ctrl = ServerController(idx, self.servers[idx], self._server_ui_update)
-                self.controllers[idx] = ctrl
-            ctrl.cfg = self.servers[idx]
-            started = ctrl.start_download(stations, params)
-            if started:
-                # update UI label if tab exists
-                ui = self.server_tabs.get(idx)
-                if ui:
-                    ui["status_lbl"].config(text="Scheduled Downloading...")
-            append_history(f"Scheduler started download for server idx {idx}")
+            jobs.append((idx, params, stations))
+
+        # Run servers concurrently, at most max_parallel_servers at a time; the rest
+        # start as earlier ones finish. Blocks this (job) thread until all are done.
+        with ThreadPoolExecutor(max_workers=max(1, self.max_parallel_servers)) as ex:
+            list(ex.map(lambda job: self._kickoff(*job), jobs))
+
+    def _kickoff(self, idx, params, stations):
+        ctrl = self.controllers[idx]
+        ctrl.cfg = self.servers[idx]
+        if not ctrl.running:
+            # posted before the start so the worker's own updates replace it
+            ctrl.post_status("Scheduled Downloading...")
+        started = ctrl.start_download(stations, params)
+        append_history(f"Scheduler started download for server idx {idx}")
+        if started:
+            # hold this pool slot until the server is done
+            ctrl.thread.join()
 
     # -------------------------
     # Misc helpers
     # -------------------------
     def _preview_remote_dir_for_server(self, server_cfg):
-        """Simple directory preview, same behavior as previous working version."""
+        """Simple directory preview; the listing is fetched on the I/O pool so the window never freezes."""
         host = server_cfg.get("host")
         if not host:
             messagebox.showerror("Error", "Server host not configured")
@@ -756,35 +962,63 @@ class FTPDownloaderApp:
         pwd = server_cfg.get("pass", "")
         remote = server_cfg.get("remote", "/")
 
-        try:
-            ftp = ftp_connect(host, user, pwd, port=port, retries=2)
-            files = []
+        # one preview per server at a time, so repeated clicks can't fill the I/O pool
+        key = (host, port, user)
+        if key in self._previews_pending:
+            return
+        self._previews_pending.add(key)
+        fut = self._io_pool.submit(self._do_preview, host, user, pwd, port, remote)
+        # hand the result back to the Tk thread
+        fut.add_done_callback(lambda f: self.root.after(0, self._show_preview_dialog, host, remote, f, key))
+
+    @staticmethod
+    def _do_preview(host, user, pwd, port, remote):
+        # pooled: previewing the same server again skips the login; a pool of its
+        # own ("ui") so it never waits for connections busy with downloads
+        with get_pool(host, user, pwd, port=port, retries=2, size=1, tag="ui").connection() as ftp:
+            entries = []
             try:
-                ftp.cwd(remote)
-                files = ftp.nlst()
+                # MLSD/NLST take the path directly; no CWD round-trip first
+                entries = list_entries(ftp, remote, limit=PREVIEW_LIMIT)
             except Exception:
                 # fallback to listing root if remote path fails
                 try:
-                    ftp.cwd("/")
-                    files = ftp.nlst()
+                    entries = list_entries(ftp, "/", limit=PREVIEW_LIMIT)
                 except Exception:
-                    files = []
-            ftp.quit()
-
-            # show simple popup with file list
-            top = tk.Toplevel(self.root)
-            top.title(f"Remote Dir: {host}  ({remote})")
-            text = tk.Text(top, width=80, height=30)
-            text.pack(fill="both", expand=True)
-            text.insert("1.0", "\n".join(files) if files else "(No files found)")
-            append_history(f"Previewed {remote} on {host}")
+                    entries = []
+            return [FTPDownloaderApp._format_entry(name, facts) for name, facts in entries]
+
+    @staticmethod
+    def _format_entry(name, facts):
+        # MLSD facts come for free: mark folders, show file sizes
+        if facts.get("type") == "dir":
+            return name + "/"
+        size = facts.get("size")
+        return f"{name}  ({int(size):,} bytes)" if size and size.isdigit() else name
+
+    def _show_preview_dialog(self, host, remote, fut, key):
+        self._previews_pending.discard(key)
+        try:
+            files = fut.result()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to preview: {e}")
             append_history(f"Preview failed for {host}: {e}")
-            
-    # Fix earlier accidental recursion by reusing the implementation method above
-    # (But ensure name collision avoided — actually _preview_remote_dir_for_server is implemented above)
-    # So the above line is not needed. Keep the accurate, implemented method used earlier.
+            return
+
+        # show simple popup with file list
+        top = tk.Toplevel(self.root)
+        top.title(f"Remote Dir: {host}  ({remote})")
+        text = tk.Text(top, width=80, height=30)
+        text.pack(fill="both", expand=True)
+        if not files:
+            text.insert("1.0", "(No files found)")
+        # insert in slices so a huge listing never becomes one giant string,
+        # and the dialog paints while the rest is added
+        for i in range(0, len(files), PREVIEW_CHUNK):
+            text.insert("end", "\n".join(files[i:i + PREVIEW_CHUNK]) + "\n")
+            text.update_idletasks()
+        append_history(f"Previewed {remote} on {host}")
+
 
 def main():
     root = tk.Tk()